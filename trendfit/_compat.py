@@ -0,0 +1,46 @@
+"""Compatibility layer for optional dependencies."""
+
+import threading
+from contextlib import contextmanager
+
+try:
+    from numba import njit, prange
+    has_numba = True
+except ImportError:
+    has_numba = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Dummy replacement for :func:`numba.njit` (no compilation)."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+
+        return lambda func: func
+
+
+_numba_state = threading.local()
+
+
+def numba_parallel_enabled():
+    """Returns False if parallel numba functions must not be used in
+    the current thread.
+
+    """
+    return getattr(_numba_state, 'parallel', True)
+
+
+@contextmanager
+def numba_serial():
+    """Context manager for using the serial variants of numba functions
+    in the current thread, e.g., in workers that already run in
+    parallel (avoids concurrent access to numba's threading layer and
+    CPU oversubscription).
+
+    """
+    old = numba_parallel_enabled()
+    _numba_state.parallel = False
+
+    try:
+        yield
+    finally:
+        _numba_state.parallel = old
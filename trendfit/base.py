@@ -63,6 +63,15 @@ class BaseEstimator:
     def _predict(self, t):
         raise NotImplementedError()
 
+    def _fixed_design(self, t):
+        """Return ``(reg_idx, mat)`` if the model is linear in its
+        parameters and its design matrix doesn't depend on the data
+        (i.e., fitting reduces to ordinary least squares), or None
+        otherwise.
+
+        """
+        return None
+
     @property
     def residuals(self):
         """Returns the model residuals."""
@@ -1,8 +1,13 @@
 import copy
-from collections import defaultdict
+import warnings
 
 import numpy as np
+from scipy.linalg import solve_triangular
+from scipy.linalg.lapack import dpotrf
+from scipy.signal import lfilter
 
+from .._compat import (has_numba, njit, numba_parallel_enabled,
+                       numba_serial, prange)
 from ..base import BaseEstimator
 from ..options import OPTIONS
 
@@ -19,54 +24,156 @@ class BootstrapRunner:
         self.save_models = save_models
 
         if isinstance(random_state, np.random.RandomState):
-            self.random_state = random_state
-        else:
-            self.random_state = np.random.RandomState(seed=random_state)
+            # legacy API: seed a new generator from the given random state
+            random_state = random_state.randint(2**32, dtype=np.uint64)
+
+        self.rng = np.random.default_rng(random_state)
 
-        self.parameter_dists = defaultdict(list)
+        self.parameter_dists = {}
         self.models = []
 
-    def generate_sample(self, random_state):
+    def generate_samples(self, n_samples, rng):
+        """Returns ``n_samples`` bootstrap samples stacked as columns."""
         raise NotImplementedError()
 
-    def run(self):
+    def generate_sample(self, rng):
+        return self.generate_samples(1, rng)[:, 0]
 
-        def fit_sample(random_state=None):
-            mb = copy.deepcopy(self.model)
-            yb = self.generate_sample(random_state)
+    def _fit_samples_func(self):
 
-            mb.fit(self.model._t, yb)
+        def fit_samples(yb, serial=False):
+            # yb: bootstrap samples stacked as columns
+            if serial:
+                with numba_serial():
+                    return fit_samples(yb)
 
-            pb = mb.parameters.copy()
+            res = []
 
-            if self.save_models:
-                return mb, pb
+            if not self.save_models:
+                # a single (worker-local) model copy, re-fitted for all
+                # samples here, instead of one copy per sample
+                mb = copy.deepcopy(self.model)
+
+            for j in range(yb.shape[1]):
+                if self.save_models:
+                    mb = copy.deepcopy(self.model)
+
+                mb.fit(self.model._t, yb[:, j])
+
+                pb = mb.parameters.copy()
+
+                if self.save_models:
+                    res.append((mb, pb))
+                else:
+                    res.append((None, pb))
+
+            return res
+
+        return fit_samples
+
+    def _sample_chunks(self, max_chunk_elements=2**21):
+        # generate the bootstrap samples by chunks of columns, so that
+        # memory usage remains bounded for large time series and/or
+        # large number of samples
+        chunk_size = max(max_chunk_elements // self.model._t.size, 1)
+
+        for start in range(0, self.n_samples, chunk_size):
+            stop = min(start + chunk_size, self.n_samples)
+
+            yield (slice(start, stop),
+                   self.generate_samples(stop - start, self.rng))
+
+    def _run_lstsq(self, reg_idx, mat):
+        # the design matrix is the same for all bootstrap samples:
+        # factorize it once and solve for (chunks of) many samples at once
+        # (no model copy / re-fit).
+        q, r = np.linalg.qr(mat)
+
+        r_diag = np.abs(np.diag(r))
+        tol = np.finfo(r.dtype).eps * max(mat.shape) * r_diag.max(initial=0.)
+        full_rank = np.all(r_diag > tol)
+
+        p = np.empty((mat.shape[1], self.n_samples))
+
+        for sl, yb in self._sample_chunks():
+            if full_rank:
+                p[:, sl] = solve_triangular(r, q.T @ yb)
+            else:
+                # rank deficient system (e.g., regressor with all zeros):
+                # minimum norm solution
+                p[:, sl], _, _, _ = np.linalg.lstsq(mat, yb, rcond=None)
+
+        for k, v in self.model.parameters.items():
+            if k in reg_idx:
+                self.parameter_dists[k] = np.ascontiguousarray(p[reg_idx[k]].T)
             else:
-                del mb
-                return None, pb
+                self.parameter_dists[k] = np.repeat(np.asarray(v)[None],
+                                                    self.n_samples, axis=0)
+
+    def run(self):
+        if self.save_models:
+            design = None
+        else:
+            design = self.model._fixed_design(self.model._t)
+
+        if design is not None:
+            self._run_lstsq(*design)
+            return
+
+        fit_samples = self._fit_samples_func()
+
+        # samples are drawn (by chunks) from the runner's generator
+        # exactly like for the batched solve above, so that results don't
+        # depend on how the samples are fitted (or saved). Only the fits
+        # are run in parallel (by batches of samples, each re-using the
+        # same model copy), in which case workers must not use numba
+        # parallel functions (serial=True).
+        res = []
 
         if OPTIONS['use_dask']:
             import dask
-            import dask.bag as db
 
-            sequence = [np.random.RandomState()
-                        for _ in range(self.n_samples)]
-            b = db.from_sequence(sequence, npartitions=100)
-            dlyd = b.map(fit_sample).to_delayed()
+            for _, yb in self._sample_chunks():
+                n_batches = min(100, yb.shape[1])
+                tasks = [dask.delayed(fit_samples)(yb[:, sl], True)
+                         for sl in _split_blocks(yb.shape[1], n_batches)]
+
+                for batch_res in dask.compute(*tasks):
+                    res += batch_res
+
+        elif OPTIONS['n_jobs'] is not None:
+            import joblib
+
+            # a few batches per worker for load balancing
+            n_workers = joblib.effective_n_jobs(OPTIONS['n_jobs'])
 
-            res = dask.compute(*dlyd) # returns a list of 100 lists (npartitions=100) of results (because of dask bag) 
-            res = [item for sublist in res for item in sublist] # flattens the list of list
+            with joblib.Parallel(n_jobs=OPTIONS['n_jobs']) as parallel:
+                for _, yb in self._sample_chunks():
+                    n_batches = min(4 * n_workers, yb.shape[1])
+                    batches = _split_blocks(yb.shape[1], n_batches)
+
+                    for batch_res in parallel(
+                            joblib.delayed(fit_samples)(yb[:, sl], True)
+                            for sl in batches):
+                        res += batch_res
 
         else:
-            res = [fit_sample(self.random_state)
-                   for _ in range(self.n_samples)]
+            for _, yb in self._sample_chunks():
+                res += fit_samples(yb)
 
-        for mb, pb in res:
+        for i, (mb, pb) in enumerate(res):
             if self.save_models:
                 self.models.append(mb)
 
             for k, v in pb.items():
-                self.parameter_dists[k].append(v)
+                if i == 0:
+                    # shapes are known after the first sample
+                    v = np.asarray(v)
+                    self.parameter_dists[k] = np.empty(
+                        (self.n_samples,) + v.shape, dtype=v.dtype
+                    )
+
+                self.parameter_dists[k][i] = v
 
 
 class BootstrapResults:
@@ -82,6 +189,8 @@ class BootstrapResults:
         """Returns the bootstrap sampled distributions of
         the parameters of the estimator.
 
+        Each distribution is an array of shape ``(n_samples, ...)``.
+
         """
         return self._runner.parameter_dists
 
@@ -113,8 +222,7 @@ class BootstrapResults:
         alpha = 1 - confidence_level
 
         for k, v in self.parameter_dists.items():
-            lower = np.quantile(v, alpha / 2, axis=0)
-            upper = np.quantile(v, 1 - alpha / 2, axis=0)
+            lower, upper = np.quantile(v, [alpha / 2, 1 - alpha / 2], axis=0)
 
             ci_bounds[k] = (lower, upper)
 
@@ -126,11 +234,13 @@ class ResidualResamplingRunner(BootstrapRunner):
     def __init__(self, model, **kwargs):
         super().__init__(model, **kwargs)
 
-    def generate_sample(self, random_state):
-        errors = self.model.residuals.copy()
-        random_state.shuffle(errors)
+    def generate_samples(self, n_samples, rng):
+        # permute the residuals independently for each sample (column)
+        errors = np.broadcast_to(self.model.residuals[:, None],
+                                 (self.model.residuals.size, n_samples)).copy()
+        rng.permuted(errors, axis=0, out=errors)
 
-        return self.model._y_predict + errors
+        return self.model._y_predict[:, None] + errors
 
 
 def residual_resampling(model, n_samples=1000, **kwargs):
@@ -152,11 +262,11 @@ def residual_resampling(model, n_samples=1000, **kwargs):
     Other Parameters
     ----------------
     random_state: int or object, optional
-        Random seed or an instance of :class:`numpy.random.RandomState`
+        Random seed or an instance of :class:`numpy.random.Generator`
         used to generate the bootstrap samples, for reproducible
-        experiments. If None (default), a new random state is defined.
-        Note that this is ignored when running a bootstrap algorithm in
-        parallel using dask.
+        experiments. If None (default), a new generator is created.
+        An instance of :class:`numpy.random.RandomState` is also
+        accepted (used to seed a new generator).
     save_models: bool, optional
         If True, save all estimator instances created during the
         bootstrap run (default: False). This is useful, e.g., for
@@ -172,20 +282,104 @@ def residual_resampling(model, n_samples=1000, **kwargs):
 
 
 def _cholesky_decomposition(t, gamma):
-    mat = np.triu(gamma**(t[None, :] - t[:, None]))
-    mat2 = .999999999999999*mat + .999999999999999*mat.transpose()
-    np.fill_diagonal(mat2, 1.0)
+    # symmetric covariance matrix of the autoregressive process
+    mat = np.abs(np.subtract.outer(t, t))
+
+    if gamma > 0:
+        # gamma**mat as exp(log(gamma) * mat), in-place
+        # (much cheaper than elementwise pow)
+        np.multiply(mat, np.log(gamma), out=mat)
+        np.exp(mat, out=mat)
+    else:
+        mat = gamma**mat
 
-    return np.linalg.cholesky(mat2)
+    # slightly shrink the off-diagonal terms so that the matrix remains
+    # positive definite, e.g., with duplicate time values
+    mat *= .999999999999999
+    np.fill_diagonal(mat, 1.0)
+
+    # call LAPACK's (blocked) potrf directly, in-place (mat is symmetric,
+    # its transpose is a Fortran-contiguous view of the same data)
+    l, info = dpotrf(mat.T, lower=True, clean=True, overwrite_a=True)
+
+    if info > 0:
+        raise np.linalg.LinAlgError("Matrix is not positive definite")
+    elif info < 0:
+        raise ValueError("Illegal value in argument {} of potrf"
+                         .format(-info))
+
+    return l
+
+
+@njit(nogil=True, cache=True)
+def _ar1_filter_column(iid, g, out, j):
+    s = np.sqrt(1. - g * g)
+
+    out[0, j] = iid[0, j]
+
+    for k in range(1, iid.shape[0]):
+        out[k, j] = g * out[k - 1, j] + s * iid[k, j]
+
+
+@njit(parallel=True, cache=True)
+def _ar1_filter_nb(iid, g, out):
+    for j in prange(iid.shape[1]):
+        _ar1_filter_column(iid, g, out, j)
+
+    return out
+
+
+@njit(nogil=True, cache=True)
+def _ar1_filter_nb_serial(iid, g, out):
+    # serial variant (releases the GIL), used within parallel workers
+    for j in range(iid.shape[1]):
+        _ar1_filter_column(iid, g, out, j)
+
+    return out
+
+
+def _ar1_filter(iid, g, out):
+    # AR(1) process with unit variance, i.e, e[0] = iid[0] and
+    # e[k] = g * e[k - 1] + sqrt(1 - g**2) * iid[k] along axis 0.
+    # This is exactly L @ iid where L is the Cholesky factor of the
+    # covariance matrix g**|i - j| (evenly spaced samples).
+    if has_numba and numba_parallel_enabled():
+        return _ar1_filter_nb(iid, g, out)
+    elif has_numba:
+        return _ar1_filter_nb_serial(iid, g, out)
+
+    s = np.sqrt(1. - g * g)
+    zi = (1. - s) * iid[:1]
+    out[:], _ = lfilter([s], [1., -g], iid, axis=0, zi=zi)
+
+    return out
+
+
+def _is_evenly_spaced(t):
+    dt = np.diff(t)
+
+    return dt.size == 0 or np.allclose(dt, dt[0], rtol=1e-6, atol=0.)
+
+
+def _split_blocks(size, n_blocks):
+    # same splitting as np.array_split, but returns slices
+    q, r = divmod(size, n_blocks)
+    bounds = np.cumsum([0] + [q + 1] * r + [q] * (n_blocks - r))
+
+    return [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
 
 
 class BlockARWildRunner(BootstrapRunner):
 
-    def __init__(self, model, ar_coef=None, block_size=500, use_cache=False,
+    def __init__(self, model, ar_coef=None, block_size=500, use_cache=None,
                  **kwargs):
+        if use_cache is not None:
+            warnings.warn("`use_cache` is deprecated and has no effect: "
+                          "Cholesky decompositions are now always cached.",
+                          FutureWarning, stacklevel=3)
+
         self.ar_coef = ar_coef
         self.block_size = block_size
-        self.use_cache = use_cache
 
         super().__init__(model, **kwargs)
 
@@ -204,44 +398,70 @@ class BlockARWildRunner(BootstrapRunner):
         else:
             gamma = self.ar_coef
 
-        t_blocks = np.array_split(t, self._n_blocks)
+        l_blocks = []
 
-        return [_cholesky_decomposition(tb, gamma) for tb in t_blocks]
+        for sl in self._block_slices:
+            tb = t[sl]
 
-    def _generate_sample_err(self, residuals, random_state):
-        if self.use_cache:
-            l_blocks = self._l_blocks
-        else:
-            l_blocks = self._block_cholesky_decomp()
+            if _is_evenly_spaced(tb):
+                # no need for Cholesky decomposition (see _ar1_filter)
+                # only store the AR(1) coefficient
+                if tb.size > 1:
+                    g = gamma**(tb[1] - tb[0])
+
+                    # same error than for the Cholesky decomposition
+                    # (also catches nan values)
+                    if not abs(g) < 1.:
+                        raise np.linalg.LinAlgError(
+                            "Matrix is not positive definite"
+                        )
+
+                    l_blocks.append(g)
+                else:
+                    l_blocks.append(0.)
+            else:
+                l_blocks.append(_cholesky_decomposition(tb, gamma))
 
-        iid = random_state.normal(loc=0., scale=1.,
-                                  size=self.model._t.size)
+        return l_blocks
+
+    def _generate_samples_err(self, residuals, n_samples, rng):
+        # (n_samples, size) then transpose so that the random draws
+        # are the same than when generating the samples one by one
+        iid = rng.standard_normal(size=(n_samples, self.model._t.size)).T
+
+        # compute the errors of each block directly in the output array
+        errors = np.empty_like(iid)
+
+        for lb, sl in zip(self._l_blocks, self._block_slices):
+            if np.ndim(lb):
+                # one matrix-matrix product per block for all samples
+                np.matmul(lb, iid[sl], out=errors[sl])
+            else:
+                _ar1_filter(iid[sl], lb, errors[sl])
 
-        r_blocks = np.array_split(residuals, self._n_blocks)
-        iid_blocks = np.array_split(iid, self._n_blocks)
+            errors[sl] *= residuals[sl, None]
 
-        return np.concatenate([
-            (lb @ iidb).ravel() * rb
-            for lb, rb, iidb in zip(l_blocks, r_blocks, iid_blocks)
-        ])
+        return errors
 
-    def generate_sample(self, random_state):
-        errors = self._generate_sample_err(self.model.residuals,
-                                           random_state)
+    def generate_samples(self, n_samples, rng):
+        errors = self._generate_samples_err(self.model.residuals,
+                                            n_samples, rng)
 
-        return self.model._y_predict + errors
+        return self.model._y_predict[:, None] + errors
 
     def run(self):
-        self._n_blocks = max(self.model._t.size // self.block_size, 1)
+        n_blocks = max(self.model._t.size // self.block_size, 1)
 
-        if self.use_cache:
-            self._l_blocks = self._block_cholesky_decomp()
+        # time blocks are the same for all samples: compute the
+        # Cholesky decompositions (or AR(1) coefficients) only once
+        self._block_slices = _split_blocks(self.model._t.size, n_blocks)
+        self._l_blocks = self._block_cholesky_decomp()
 
         super().run()
 
 
 def block_ar_wild(model, ar_coef=None, block_size=500, n_samples=1000,
-                  use_cache=False, **kwargs):
+                  use_cache=None, **kwargs):
     """Block Autoregressive Wild Bootstrap.
 
     Generate bootstrap samples with autocorrelated errors using the
@@ -263,20 +483,18 @@ def block_ar_wild(model, ar_coef=None, block_size=500, n_samples=1000,
     n_samples : int, optional
         Number of bootstrap samples generated (default: 1000)
     use_cache : bool, optional
-        If True, eagerly compute Cholesky decomposition for generating
-        autocorrelated samples and cache the results in memory.
-        (default: False). Beware that if parallel computation is enabled
-        with dask (depending on which scheduler is used) this might be highly
-        memory expensive!!
+        Deprecated, has no effect. The Cholesky decompositions used for
+        generating autocorrelated samples are now always computed once
+        and cached in memory.
 
     Other Parameters
     ----------------
     random_state: int or object, optional
-        Random seed or an instance of :class:`numpy.random.RandomState`
+        Random seed or an instance of :class:`numpy.random.Generator`
         used to generate the bootstrap samples, for reproducible
-        experiments. If None (default), a new random state is defined.
-        Note that this is ignored when running a bootstrap algorithm in
-        parallel using dask.
+        experiments. If None (default), a new generator is created.
+        An instance of :class:`numpy.random.RandomState` is also
+        accepted (used to seed a new generator).
     save_models: bool, optional
         If True, save all estimator instances created during the
         bootstrap run (default: False). This is useful, e.g., for
@@ -1,6 +1,8 @@
 import numpy as np
+import scipy.linalg
 from scipy.optimize import dual_annealing
 
+from .._compat import has_numba, njit, numba_parallel_enabled, prange
 from ..base import BaseEstimator
 
 
@@ -50,35 +52,53 @@ class LinearNoTrendFourier(BaseEstimator):
 
         super().__init__()
 
-    def _fourier_terms(self, t, degree):
-        return [np.cos(2 * degree * np.pi * t),
-                np.sin(2 * degree * np.pi * t)]
-
-    def _regressor_terms(self, t):
-        reg_terms = []
+    def _regressor_terms(self, t, n_extra=0):
+        # fill a pre-allocated (Fortran-ordered, i.e., LAPACK-friendly)
+        # design matrix. n_extra: number of columns appended by subclasses
+        n_terms = self.f_order * 2 + 1
+        mat = np.empty((t.size, n_terms + n_extra), order='F')
         reg_idx = {}
 
         # fourier terms
         if self.f_order:
-            for degree in range(1, self.f_order + 1):
-                reg_terms += self._fourier_terms(t, degree)
+            # (interleaved) cos / sin columns. Only compute the trigonometric
+            # functions for the 1st degree, then use the recurrence relations
+            # cos((j+1)x) = 2 cos(x) cos(jx) - cos((j-1)x) (same for sin)
+            np.cos(2 * np.pi * t, out=mat[:, 0])
+            np.sin(2 * np.pi * t, out=mat[:, 1])
 
-            reg_idx['fourier_terms'] = slice(0, self.f_order * 2)
+            two_cos = 2 * mat[:, 0]
+            cos_prev, sin_prev = 1., 0.
 
-        # intercept
-        reg_terms.append(np.ones(t.size))
+            for j in range(2, self.f_order * 2, 2):
+                np.multiply(two_cos, mat[:, j - 2], out=mat[:, j])
+                mat[:, j] -= cos_prev
+                np.multiply(two_cos, mat[:, j - 1], out=mat[:, j + 1])
+                mat[:, j + 1] -= sin_prev
 
-        if self.f_order:
-            reg_idx['intercept'] = self.f_order * 2
-        else:
-            reg_idx['intercept'] = 0
-
-        return reg_idx, reg_terms
+                cos_prev, sin_prev = mat[:, j - 2], mat[:, j - 1]
 
-    def _solve_lstsq(self, t, y, reg_idx, reg_terms):
-        mat = np.stack(reg_terms).transpose()
+            reg_idx['fourier_terms'] = slice(0, self.f_order * 2)
 
-        p, ssr, _, _ = np.linalg.lstsq(mat, y, rcond=None)
+        # intercept
+        mat[:, n_terms - 1] = 1.
+        reg_idx['intercept'] = n_terms - 1
+
+        return reg_idx, mat
+
+    def _solve_lstsq(self, t, y, reg_idx, mat):
+        # complete orthogonal factorization (QR-based) is much cheaper
+        # than the default SVD-based driver for such small, well
+        # conditioned systems
+        p, _, rank, _ = scipy.linalg.lstsq(mat, y, lapack_driver='gelsy')
+
+        # sum of squares of residuals (not returned by the gelsy driver),
+        # empty if the system is rank deficient
+        if rank == mat.shape[1] and mat.shape[0] > rank:
+            res = y - mat @ p
+            ssr = np.array([res @ res])
+        else:
+            ssr = np.array([])
 
         for k, idx in reg_idx.items():
             self._parameters[k] = p[idx]
@@ -86,24 +106,25 @@ class LinearNoTrendFourier(BaseEstimator):
         return ssr
 
     def _fit(self, t, y):
-        reg_idx, reg_terms = self._regressor_terms(t)
+        reg_idx, mat = self._regressor_terms(t)
 
-        return self._solve_lstsq(t, y, reg_idx, reg_terms)[0]
+        return self._solve_lstsq(t, y, reg_idx, mat)[0]
 
-    def _compute_y(self, t, reg_idx, reg_terms):
-        p = np.empty((len(reg_terms)))
+    def _compute_y(self, t, reg_idx, mat):
+        p = np.empty(mat.shape[1])
 
         for k, idx in reg_idx.items():
             p[idx] = self._parameters[k]
 
-        mat = np.stack(reg_terms).transpose()
-
-        return (mat @ p[:, None]).ravel()
+        return mat @ p
 
     def _predict(self, t):
-        reg_idx, reg_terms = self._regressor_terms(t)
+        reg_idx, mat = self._regressor_terms(t)
+
+        return self._compute_y(t, reg_idx, mat)
 
-        return self._compute_y(t, reg_idx, reg_terms)
+    def _fixed_design(self, t):
+        return self._regressor_terms(t)
 
 
 class LinearTrendFourier(LinearNoTrendFourier):
@@ -146,14 +167,27 @@ class LinearTrendFourier(LinearNoTrendFourier):
 
         self._parameters.update({'trend': None})
 
-    def _regressor_terms(self, t):
-        reg_idx, reg_terms = super()._regressor_terms(t)
+    def _regressor_terms(self, t, n_extra=0):
+        reg_idx, mat = super()._regressor_terms(t, n_extra + 1)
 
         # add trend
-        reg_terms.append(t)
+        mat[:, self.f_order * 2 + 1] = t
         reg_idx.update({'trend': self.f_order * 2 + 1})
 
-        return reg_idx, reg_terms
+        return reg_idx, mat
+
+
+def _trend_change_term(t, t_break, out, is_sorted=False):
+    # compute max(0, t - t_break) in-place, without temporary arrays
+    if is_sorted:
+        idx = np.searchsorted(t, t_break, side='right')
+        out[:idx] = 0.
+        np.subtract(t[idx:], t_break, out=out[idx:])
+    else:
+        np.subtract(t, t_break, out=out)
+        np.maximum(out, 0., out=out)
+
+    return out
 
 
 class LinearBrokenTrendFourier(LinearTrendFourier):
@@ -245,30 +279,54 @@ class LinearBrokenTrendFourier(LinearTrendFourier):
         self._opt_kwargs = opt_kwargs
 
     def _regressor_terms(self, t, t_break):
-        reg_idx, reg_terms = super()._regressor_terms(t)
+        reg_idx, mat = super()._regressor_terms(t, 1)
 
         # add trend breaking point
-        reg_terms.append(np.where(t > t_break, t - t_break, 0.))
+        _trend_change_term(t, t_break, mat[:, self.f_order * 2 + 2])
         reg_idx.update({'trend_change': self.f_order * 2 + 2})
 
-        return reg_idx, reg_terms
+        return reg_idx, mat
 
     def _fit(self, t, y):
 
-        def solve_for_location(t_break):
-            # solve system with a-priori t_break value
-
-            reg_idx, reg_terms = self._regressor_terms(t, t_break)
+        def solve_for_location(x):
+            # solve system with a-priori t_break value.
+            # Only the trend change regressor depends on t_break: project
+            # it onto the orthogonal complement of the other (fixed)
+            # regressors and update the sum of squares of residuals
+            # (no need to rebuild the design matrix and re-solve).
+            col = _trend_change_term(t, x[0], col_buffer, is_sorted)
+            col_perp = col - q @ (q.T @ col)
+
+            cc = col @ col
+            cc_perp = col_perp @ col_perp
+
+            # system solving issues with t_break near bounds (regressor
+            # (nearly) collinear with the others: rank deficient system).
+            # The threshold must be well above the rounding errors of the
+            # projection.
+            if cc_perp <= tol * cc or cc == 0.:
+                return np.inf
 
-            ssr = self._solve_lstsq(t, y, reg_idx, reg_terms)
+            cr = col_perp @ res_base
+            ssr = ssr_base - cr * cr / cc_perp
 
-            # system solving issues with t_break near bounds
-            if not len(ssr):
+            if not 0. <= ssr <= ssr_base:
                 return np.inf
-            else:
-                return ssr[0]
+
+            return ssr
 
         if self._fit_t_break:
+            _, base_mat = super()._regressor_terms(t)
+            q, _ = np.linalg.qr(base_mat)
+
+            res_base = y - q @ (q.T @ y)
+            ssr_base = res_base @ res_base
+            tol = 100 * np.finfo(float).eps
+
+            col_buffer = np.zeros_like(t, dtype=np.float64)
+            is_sorted = not np.any(t[1:] < t[:-1])
+
             if self._opt_bounds is None:
                 bounds = [(t[1], t[-1])]
             else:
@@ -282,10 +340,8 @@ class LinearBrokenTrendFourier(LinearTrendFourier):
             self._parameters['t_break'] = res.x[0]
 
         # rerun lstsq to properly set other parameter values
-        reg_idx, reg_terms = self._regressor_terms(
-            t, self._parameters['t_break']
-        )
-        res_lstsq = self._solve_lstsq(t, y, reg_idx, reg_terms)
+        reg_idx, mat = self._regressor_terms(t, self._parameters['t_break'])
+        res_lstsq = self._solve_lstsq(t, y, reg_idx, mat)
 
         if self._fit_t_break:
             return res
@@ -293,11 +349,16 @@ class LinearBrokenTrendFourier(LinearTrendFourier):
             return res_lstsq
 
     def _predict(self, t):
-        reg_idx, reg_terms = self._regressor_terms(
-            t, self._parameters['t_break']
-        )
+        reg_idx, mat = self._regressor_terms(t, self._parameters['t_break'])
 
-        return self._compute_y(t, reg_idx, reg_terms)
+        return self._compute_y(t, reg_idx, mat)
+
+    def _fixed_design(self, t):
+        # the location of the trend break is re-estimated at each fit
+        if self._fit_t_break:
+            return None
+
+        return self._regressor_terms(t, self._parameters['t_break'])
 
 
 def epanechnikov_kernel(u):
@@ -307,6 +368,80 @@ def epanechnikov_kernel(u):
     return weight * mask
 
 
+@njit(fastmath=True, nogil=True, cache=True)
+def _epanechnikov_local_constant_at(t, y, tau_i, h):
+    # kernel weighted mean at tau_i. ``t`` must be sorted.
+    num = 0.
+    den = 0.
+
+    # the kernel has compact support: only visit t in [tau - h, tau + h]
+    start = np.searchsorted(t, tau_i - h)
+    stop = np.searchsorted(t, tau_i + h, side='right')
+
+    for j in range(start, stop):
+        u = (tau_i - t[j]) / h
+
+        if abs(u) <= 1.:
+            k = 0.75 * (1. - u * u)
+            num += k * y[j]
+            den += k
+
+    if den > 0.:
+        return num / den
+    else:
+        return np.nan
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _epanechnikov_local_constant_nb(t, y, tau, h):
+    # fused kernel weights + weighted mean, without allocating
+    # the (tau.size, t.size) kernel matrix. ``t`` must be sorted.
+    m_hat = np.empty(tau.size)
+
+    for i in prange(tau.size):
+        m_hat[i] = _epanechnikov_local_constant_at(t, y, tau[i], h)
+
+    return m_hat
+
+
+@njit(fastmath=True, nogil=True, cache=True)
+def _epanechnikov_local_constant_nb_serial(t, y, tau, h):
+    # serial variant (releases the GIL), used within parallel workers
+    m_hat = np.empty(tau.size)
+
+    for i in range(tau.size):
+        m_hat[i] = _epanechnikov_local_constant_at(t, y, tau[i], h)
+
+    return m_hat
+
+
+def _epanechnikov_local_constant(t, y, tau, h, max_chunk_elements=2**20):
+    # NumPy version: for each tau, compute kernel weights only within
+    # the [tau - h, tau + h] window. Evaluation points are processed
+    # in chunks of (chunk_size, window_size) elements. ``t`` must be sorted.
+    start = np.searchsorted(t, tau - h)
+    stop = np.searchsorted(t, tau + h, side='right')
+
+    width = max(np.max(stop - start, initial=0), 1)
+    chunk_size = max(max_chunk_elements // width, 1)
+    offsets = np.arange(width)
+
+    m_hat = np.empty(tau.size)
+
+    for i in range(0, tau.size, chunk_size):
+        sl = slice(i, i + chunk_size)
+
+        idx = start[sl, None] + offsets
+        valid = idx < stop[sl, None]
+        idx = np.minimum(idx, t.size - 1)
+
+        k = epanechnikov_kernel((tau[sl, None] - t[idx]) / h) * valid
+
+        m_hat[sl] = np.sum(k * y[idx], axis=1) / np.sum(k, axis=1)
+
+    return m_hat
+
+
 class KernelTrend(BaseEstimator):
     """Non-parametric kernel regression.
 
@@ -330,15 +465,46 @@ class KernelTrend(BaseEstimator):
             'bandwidth': bandwidth,
         }
 
-    def _local_constant(self, t, y, tau=None):
+    def _local_constant(self, t, y, tau=None, max_chunk_elements=2**20):
+        # max_chunk_elements: max size of temporary (chunked) arrays
         if tau is None:
             tau = t
 
-        pairwise_dists = np.subtract.outer(tau, t)
+        h = self._parameters['bandwidth']
+
+        if self.kernel_func is epanechnikov_kernel:
+            t = np.asarray(t, dtype=np.float64)
+            y = np.asarray(y, dtype=np.float64)
+            tau = np.asarray(tau, dtype=np.float64)
 
-        k = self.kernel_func(pairwise_dists / self._parameters['bandwidth'])
+            if np.any(t[1:] < t[:-1]):
+                order = np.argsort(t, kind='stable')
+                t = t[order]
+                y = y[order]
 
-        return k @ y / np.sum(k, axis=1)
+            if has_numba and numba_parallel_enabled():
+                return _epanechnikov_local_constant_nb(t, y, tau, float(h))
+            elif has_numba:
+                return _epanechnikov_local_constant_nb_serial(t, y, tau,
+                                                              float(h))
+            else:
+                return _epanechnikov_local_constant(
+                    t, y, tau, h, max_chunk_elements=max_chunk_elements
+                )
+
+        # arbitrary kernel (support unknown): compute it for chunks
+        # of evaluation points to limit memory usage
+        chunk_size = max(max_chunk_elements // t.size, 1)
+        m_hat = np.empty(tau.size)
+
+        for i in range(0, tau.size, chunk_size):
+            sl = slice(i, i + chunk_size)
+
+            k = self.kernel_func(np.subtract.outer(tau[sl], t) / h)
+
+            m_hat[sl] = k @ y / np.sum(k, axis=1)
+
+        return m_hat
 
     def _fit(self, t, y):
         self._t_scaled = (t - t[0]) / (t[-1] - t[0])
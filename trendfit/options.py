@@ -1,5 +1,6 @@
 OPTIONS = {
-    'use_dask': False
+    'use_dask': False,
+    'n_jobs': None,
 }
 
 
@@ -8,7 +9,17 @@ class set_options:
 
     Currently supported options:
 
-    - ``use_dask``: Enable dask for parallel operations where supported.
+    - ``n_jobs``: Number of parallel jobs used (with joblib) for running
+      operations such as bootstrap where supported. -1 means using all
+      processors. Joblib's default backend (processes) is used unless
+      another one is selected with :func:`joblib.parallel_backend`.
+      Thread-based parallelism (``'threading'`` backend) is cheaper but
+      only effective for models that release the GIL (e.g.,
+      :class:`~trendfit.models.KernelTrend` with numba installed), not
+      for models fitted with :func:`scipy.optimize.dual_annealing`.
+      Default: ``None`` (no parallelism).
+    - ``use_dask``: Enable dask for parallel operations where supported
+      (uses dask's current scheduler; takes precedence over ``n_jobs``).
       Default: ``False``.
 
     You can use ``set_options`` either as a context manager or to set